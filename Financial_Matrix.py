@@ -1,10 +1,102 @@
+import functools
+import os
+import tempfile
+import threading
+import webbrowser
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
 import numpy as np
 import plotly.graph_objects as go
 import tkinter as tk
 from tkinter import ttk, messagebox
 
+# Static figure styling, built once at import and shared by every graph
+BASE_SURFACE_KW = dict(
+    colorscale='Viridis',
+    colorbar=dict(title='Ending Balance ($)'),
+    contours=dict(z=dict(show=False)),
+)
+BASE_LAYOUT = go.Layout(
+    title="Interactive 3D Account Balance Graph",
+    scene=dict(
+        xaxis_title='Time (years)',
+        yaxis_title='Growth Rate (%)',
+        zaxis_title='Ending Balance ($)',
+        xaxis=dict(tickmode="array"),
+        yaxis=dict(tickmode="array"),
+    ),
+)
+
+# Function to compute the ending balance grid (rates down the rows, years across the columns).
+# Pure NumPy with scalar inputs, returning (years, whole-number rate percentages, balances).
+def _balance_grid(principal, annual_contribution, t_start, t_end, r_min_pct, r_max_pct):
+    # Create ranges for time and growth rate (as integers for display)
+    # Rates are a column vector so they broadcast against the time row
+    # without materializing full meshgrid arrays.
+    # The math runs in float64 so long horizons at high rates don't overflow.
+    t = np.arange(t_start, t_end + 1, dtype=np.float64)  # Whole number years
+    r_pct = np.arange(r_min_pct, r_max_pct + 1, dtype=np.int32)  # Whole number rates
+    r = (r_pct / 100.0).reshape(-1, 1)  # Exactly 0.0 where r_pct == 0
+
+    # expm1/log1p give (1 + r)**t - 1 exactly at r == 0, where the
+    # contribution term falls back to its limit of one payment per year.
+    # Work is done in place so only two full grids are ever allocated.
+    growth_m1 = t * np.log1p(r)
+    np.expm1(growth_m1, out=growth_m1)
+    A = np.broadcast_to(t, growth_m1.shape).copy()
+    np.divide(growth_m1, r, out=A, where=(r != 0))
+    A *= annual_contribution
+    growth_m1 += 1.0
+    growth_m1 *= principal
+    A += growth_m1
+    return t, r_pct, A
+
+# Function to pick at most ~max_points evenly strided indices, always keeping both endpoints
+def _subsample_indices(n, max_points):
+    stride = max(1, -(-n // max_points))
+    idx = np.arange(0, n, stride)
+    if n > 0 and idx[-1] != n - 1:
+        idx = np.append(idx, n - 1)
+    return idx
+
+# Function to build the figure, memoized on the parsed inputs so repeated clicks skip the math.
+# The cached figure is shared between calls and must not be modified by callers.
+@functools.lru_cache(maxsize=32)
+def _build_figure(principal, annual_contribution, min_rate, max_rate, start_time, end_time):
+    # Calculate ending balance using the compound interest formula.
+    # Rounding first stops e.g. 0.29 * 100 truncating to 28 percent.
+    t, pct, A = _balance_grid(
+        principal, annual_contribution, start_time, end_time,
+        int(round(min_rate * 100, 6)), int(round(max_rate * 100, 6)),
+    )
+
+    # Cap the plotted grid (~80 years x 50 rates) so wide ranges stay quick to render
+    t_idx = _subsample_indices(t.size, 80)
+    r_idx = _subsample_indices(pct.size, 50)
+    A = A[np.ix_(r_idx, t_idx)]
+    t = t[t_idx].astype(np.float32)
+
+    # float32 is plenty for display and halves the data sent to the browser,
+    # but keep float64 when a balance is beyond float32's range.
+    if A.size and np.nanmax(np.abs(A)) <= np.finfo(np.float32).max:
+        A = A.astype(np.float32)
+    pct = pct[r_idx]  # Shared by the surface and the axis ticks
+
+    # Create a Plotly figure with a 3D surface in one step, so plotly validates it only once.
+    # Only the per-call tick values are added on top of the shared base layout.
+    fig = go.Figure(
+        data=[go.Surface(z=A, x=t, y=pct, **BASE_SURFACE_KW)],
+        layout=go.Layout(BASE_LAYOUT, scene_xaxis_tickvals=t, scene_yaxis_tickvals=pct),
+    )
+
+    return fig
+
 # Function to generate the graph
-def generate_graph(principal, annual_contribution, min_rate, max_rate, start_time, end_time):
+# show_error lets callers on other threads route error dialogs back to the Tk thread;
+# is_closed lets them skip opening the browser once the app window has gone away
+def generate_graph(principal, annual_contribution, min_rate, max_rate, start_time, end_time,
+                   show_error=messagebox.showerror, is_closed=lambda: False):
     try:
         # Convert inputs to appropriate data types
         principal = float(principal)
@@ -17,58 +109,36 @@ def generate_graph(principal, annual_contribution, min_rate, max_rate, start_tim
         # Validate input ranges
         if min_rate < 0 or max_rate < 0:
             raise ValueError("Growth rates cannot be negative.")
+        if min_rate > max_rate:
+            raise ValueError("Invalid rate range: Minimum rate cannot exceed maximum rate.")
         if start_time < 0 or end_time < 0 or start_time >= end_time:
             raise ValueError("Invalid time range: Start time must be less than end time.")
 
-        # Create ranges for time and growth rate (as integers for display)
-        t = np.arange(start_time, end_time + 1)  # Whole number years
-        r = np.arange(int(min_rate * 100), int(max_rate * 100) + 1) / 100  # Whole number rates
-
-        # Create meshgrid for 3D plot
-        T, R = np.meshgrid(t, r)
-
-        # Calculate ending balance using the compound interest formula
-        A = principal * (1 + R)**T + annual_contribution * ((1 + R)**T - 1) / R
-
-        # Create a Plotly figure
-        fig = go.Figure()
-
-        # Add a 3D surface
-        fig.add_trace(go.Surface(
-            z=A,
-            x=T,
-            y=R * 100,
-            colorscale='Viridis',
-            colorbar=dict(title='Ending Balance ($)')
-        ))
-
-        # Update layout
-        fig.update_layout(
-            title="Interactive 3D Account Balance Graph",
-            scene=dict(
-                xaxis_title='Time (years)',
-                yaxis_title='Growth Rate (%)',
-                zaxis_title='Ending Balance ($)',
-                xaxis=dict(
-                    tickmode="array",
-                    tickvals=t,
-                ),
-                yaxis=dict(
-                    tickmode="array",
-                    tickvals=r * 100,
-                ),
-            )
-        )
-
-        # Show the plot
-        fig.show()
+        # Build (or reuse) the figure for these inputs
+        fig = _build_figure(principal, annual_contribution, min_rate, max_rate, start_time, end_time)
+
+        # Show the plot; plotly.js is loaded from the CDN (and browser cache) instead of being inlined
+        html = fig.to_html(include_plotlyjs='cdn', full_html=True, include_mathjax=False)
+        if is_closed():
+            return
+        # Each graph gets its own uniquely named file, so concurrent workers never replace
+        # a page before the browser has loaded it
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', prefix='financial_matrix_',
+                                         suffix='.html', delete=False) as f:
+            try:
+                f.write(html)
+            except Exception:
+                f.close()
+                os.unlink(f.name)
+                raise
+        webbrowser.open(Path(f.name).as_uri())
 
     except ValueError as e:
         # Show error message for invalid input values
-        messagebox.showerror("Input Error", f"Invalid input: {e}")
+        show_error("Input Error", f"Invalid input: {e}")
     except Exception as e:
         # Catch any unexpected errors and display a message
-        messagebox.showerror("Error", f"An unexpected error occurred: {e}")
+        show_error("Error", f"An unexpected error occurred: {e}")
 
 # GUI Application
 def create_gui():
@@ -100,17 +170,33 @@ def create_gui():
             entry.pack(side='right', expand=True, fill='x', padx=5)
             entries[label_text] = entry
 
+        # Build and show figures off the Tk thread so the window stays responsive
+        executor = ThreadPoolExecutor(max_workers=2)
+        closing = threading.Event()
+
+        # Error dialogs must be opened from the Tk thread, and not at all once it has closed
+        def show_error_async(title, message):
+            if closing.is_set():
+                return
+            try:
+                root.after(0, messagebox.showerror, title, message)
+            except (RuntimeError, tk.TclError):
+                pass  # Window was destroyed between the check and the call
+
         # Generate button
         def on_generate():
             try:
                 values = {key: entry.get() for key, entry in entries.items()}
-                generate_graph(
+                executor.submit(
+                    generate_graph,
                     values["Principal Starting Balance ($)"],
                     values["Annual Contributions ($)"],
                     values["Minimum Growth Rate (%)"],
                     values["Maximum Growth Rate (%)"],
                     values["Start Time (years)"],
                     values["End Time (years)"],
+                    show_error=show_error_async,
+                    is_closed=closing.is_set,
                 )
             except Exception as e:
                 messagebox.showerror("Error", f"Error generating graph: {e}")
@@ -118,6 +204,16 @@ def create_gui():
         button = ttk.Button(root, text="Generate Graph", command=on_generate)
         button.pack(pady=10)
 
+        # Release cached figures and worker threads when the window is closed;
+        # jobs already running finish in the background but see the closing flag
+        def on_close():
+            closing.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+            _build_figure.cache_clear()
+            root.destroy()
+
+        root.protocol("WM_DELETE_WINDOW", on_close)
+
         # Run the GUI event loop
         root.mainloop()
 